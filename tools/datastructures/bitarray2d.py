@@ -1,3 +1,5 @@
+from typing import Iterable
+
 from BitArray2D import BitArray2D, godel
 
 
@@ -15,3 +17,16 @@ def flip(array: BitArray2D) -> BitArray2D:
         for col in range(array.columns):
             out[row, col] = array[godel(row, array.columns - col - 1)]
     return out
+
+
+def get_bit(array: BitArray2D, row: int, col: int) -> int:
+    """Same as array[godel(row, col)], without decoding the godel number bit by bit"""
+    return array.rowVectors[row][col]
+
+
+def get_runs(array: BitArray2D, row: int) -> Iterable[tuple[int, int]]:
+    """The [start, end) columns of every run of set bits in the row"""
+    start = 0
+    for run in array.rowVectors[row].runs():
+        if run[0] == "1": yield start, start + len(run)
+        start += len(run)
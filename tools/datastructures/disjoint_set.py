@@ -0,0 +1,43 @@
+import dataclasses
+from array import array
+from typing import Iterable
+
+
+@dataclasses.dataclass
+class DisjointSet:
+    """Union-find over the integers 0..size-1, with path compression and union by size"""
+    parents: array
+    sizes: array
+    count: int
+
+    def __init__(self, size: int) -> None:
+        self.parents = array('q', range(size))
+        self.sizes = array('q', [1]) * size
+        self.count = size
+
+    def find(self, i: int) -> int:
+        parents = self.parents
+        root = i
+        while parents[root] != root:
+            root = parents[root]
+        while parents[i] != root:
+            parents[i], i = root, parents[i]
+        return root
+
+    def union(self, i: int, j: int) -> int:
+        """Joins the sets of i and j, returns the root of the joined set"""
+        i, j = self.find(i), self.find(j)
+        if i == j:
+            return i
+        if self.sizes[i] < self.sizes[j]:
+            i, j = j, i
+        self.parents[j] = i
+        self.sizes[i] += self.sizes[j]
+        self.count -= 1
+        return i
+
+    def size(self, i: int) -> int:
+        return self.sizes[self.find(i)]
+
+    def roots(self) -> Iterable[int]:
+        return (i for i, parent in enumerate(self.parents) if i == parent)
@@ -1,3 +1,13 @@
+from __future__ import annotations
+
+import dataclasses
+from bisect import bisect_left, bisect_right
+from heapq import merge
+from itertools import accumulate, groupby
+from typing import Iterable, Iterator, Sequence
+
+from more_itertools.more import minmax
+
 from tools.datastructures.points import Rectangle, Segment, Point2
 
 
@@ -17,3 +27,112 @@ def intersect_segment_segment(l1: Segment, l2: Segment) -> bool:
 
 def intersect_rect_segment(r: Rectangle, s: Segment) -> bool:
     return (r.contains(s.p1) and r.contains(s.p2)) or any(intersect_segment_segment(rs, s) for rs in r.get_segments())
+
+
+def get_band_nodes(first: int, last: int) -> Iterator[int]:
+    """Nodes of a bottom-up segment tree covering the leaves in [first, last)"""
+    while first < last:
+        if first & 1:
+            yield first
+            first += 1
+        if last & 1:
+            last -= 1
+            yield last
+        first, last = first // 2, last // 2
+
+
+@dataclasses.dataclass(frozen=True)
+class SegmentBands:
+    """
+    Merge sort tree over axis-aligned segments as (fixed, start, end) sorted by their fixed coordinate,
+    each node holding the starts of its segments in order and the running maximum of their ends
+    """
+    keys: list[int]
+    starts: list[list[int]]
+    max_ends: list[list[int]]
+
+    @staticmethod
+    def from_segments(segments: Iterable[tuple[int, int, int]]) -> SegmentBands:
+        segments = sorted(segments)
+        size = len(segments)
+        nodes: list[list[tuple[int, int]]] = [[] for _ in range(size)] + [[(s1, s2)] for _, s1, s2 in segments]
+        for i in reversed(range(1, size)):
+            nodes[i] = list(merge(nodes[2 * i], nodes[2 * i + 1]))
+        return SegmentBands([key for key, _, _ in segments], [[s1 for s1, _ in node] for node in nodes],
+                            [list(accumulate((s2 for _, s2 in node), max)) for node in nodes])
+
+    def overlaps(self, lower: int, upper: int, start: int, end: int) -> bool:
+        """Whether a segment with its fixed coordinate in [lower, upper] overlaps [start, end], in O(log^2 n)"""
+        size = len(self.keys)
+        first, last = bisect_left(self.keys, lower) + size, bisect_right(self.keys, upper) + size
+        return any(self.overlaps_node(node, start, end) for node in get_band_nodes(first, last))
+
+    def overlaps_batch(self, queries: Sequence[tuple[int, int, int, int]]) -> list[bool]:
+        """
+        overlaps for each (lower, upper, start, end) query, sorted by band and then by end so that each band is
+        decomposed into nodes once and each node's starts are bisected from where the previous query stopped
+        """
+        size = len(self.keys)
+        results = [False] * len(queries)
+        order = sorted(range(len(queries)), key=lambda i: (queries[i][0], queries[i][1], queries[i][3]))
+        first = 0
+        for (lower, upper), group in groupby(order, key=lambda i: (queries[i][0], queries[i][1])):
+            # bands come in order of lower, so the first key in the band only moves right
+            first = bisect_left(self.keys, lower, first)
+            last = bisect_right(self.keys, upper, first)
+            members = list(group)
+            for node in get_band_nodes(first + size, last + size):
+                starts, max_ends = self.starts[node], self.max_ends[node]
+                count = 0
+                for i in members:
+                    if results[i]: continue
+                    _, _, start, end = queries[i]
+                    count = bisect_right(starts, end, count)
+                    results[i] = count > 0 and max_ends[count - 1] >= start
+        return results
+
+    def overlaps_node(self, node: int, start: int, end: int) -> bool:
+        # of the segments starting no later than end, the one ending last
+        count = bisect_right(self.starts[node], end)
+        return count > 0 and self.max_ends[node][count - 1] >= start
+
+
+@dataclasses.dataclass(frozen=True)
+class SegmentIndex:
+    """Axis-aligned segments banded by their fixed coordinate, horizontal as (y, x1, x2), vertical as (x, y1, y2)"""
+    horizontals: SegmentBands
+    verticals: SegmentBands
+
+    @staticmethod
+    def from_segments(segments: Iterable[Segment]) -> SegmentIndex:
+        horizontals, verticals = [], []
+        for s in segments:
+            x1, x2 = minmax(s.p1.x, s.p2.x)
+            y1, y2 = minmax(s.p1.y, s.p2.y)
+            if y1 == y2:
+                horizontals.append((y1, x1, x2))
+            else:
+                verticals.append((x1, y1, y2))
+        return SegmentIndex(SegmentBands.from_segments(horizontals), SegmentBands.from_segments(verticals))
+
+    def intersects(self, r: Rectangle) -> bool:
+        """Whether any indexed segment has a point in the closed rectangle, as any(intersect_rect_segment(r, s)) tells
+        for rectangles that are not flat"""
+        x1, x2 = minmax(r.p1.x, r.p2.x)
+        y1, y2 = minmax(r.p1.y, r.p2.y)
+        return self.horizontals.overlaps(y1, y2, x1, x2) or self.verticals.overlaps(x1, x2, y1, y2)
+
+    def intersects_batch(self, rectangles: Iterable[Rectangle]) -> list[bool]:
+        """intersects for each rectangle, with the queries against each band direction answered together"""
+        horizontal_queries, vertical_queries = [], []
+        for r in rectangles:
+            x1, x2 = min(r.p1.x, r.p2.x), max(r.p1.x, r.p2.x)
+            y1, y2 = min(r.p1.y, r.p2.y), max(r.p1.y, r.p2.y)
+            horizontal_queries.append((y1, y2, x1, x2))
+            vertical_queries.append((x1, x2, y1, y2))
+        results = self.horizontals.overlaps_batch(horizontal_queries)
+        # only rectangles clear of every horizontal still need the verticals
+        pending = [i for i, hit in enumerate(results) if not hit]
+        for i, hit in zip(pending, self.verticals.overlaps_batch([vertical_queries[i] for i in pending])):
+            results[i] = hit
+        return results
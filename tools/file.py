@@ -1,26 +1,41 @@
 import os
+from itertools import chain, islice
 from os import PathLike
-from typing import Iterable
+from typing import Iterable, Iterator
 
+BLOCK_SIZE = 1 << 16
 
-def read_last_lines(filename: PathLike, n: int = 1) -> Iterable[str]:
-    """Returns the nth before last line of a file (n=1 gives last line)"""
-    num_newlines = 0
+
+def read_lines_reversed(filename: PathLike, block_size: int = BLOCK_SIZE) -> Iterator[str]:
+    """Yields the lines of a file from the last one backwards, reading it in blocks from the end"""
     with open(filename, 'rb') as f:
-        try:
-            f.seek(-2, os.SEEK_END)
-            while num_newlines < n:
-                f.seek(-2, os.SEEK_CUR)
-                if f.read(1) == b'\n':
-                    num_newlines += 1
-        except OSError:
-            f.seek(0)
+        position = f.seek(0, os.SEEK_END)
+        tail: list[bytes] = []  # already read end of the current line, in reverse order
+        skip_last = 1  # the newline ending the file does not start a new line
+
+        while position > 0:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            block = f.read(step)
+            end = len(block)
+            search_end, skip_last = end - skip_last, 0
+
+            while (i := block.rfind(b'\n', 0, search_end)) != -1:
+                yield b''.join(chain((block[i + 1:end],), reversed(tail))).decode()
+                tail.clear()
+                end, search_end = i + 1, i
 
-        for line in f:
-            yield line.decode()
+            tail.append(block[:end])
+
+        if tail:
+            yield b''.join(reversed(tail)).decode()
+
+
+def read_last_lines(filename: PathLike, n: int = 1) -> Iterable[str]:
+    """Returns the last n lines of a file in their order (n=1 gives last line)"""
+    return reversed(list(islice(read_lines_reversed(filename), n)))
 
 
 def read_last_line(filename: PathLike) -> str | None:
-    for line in read_last_lines(filename):
-        return line
-    return None
\ No newline at end of file
+    return next(read_lines_reversed(filename), None)
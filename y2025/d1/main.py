@@ -1,8 +1,19 @@
-from typing import Iterable
+import contextlib
+import dataclasses
+import mmap
+import multiprocessing
+import os
+from array import array
+from functools import partial
+from itertools import chain
+from typing import Iterable, Iterator
 from io import open
 
 import unittest
 
+CHUNK_SIZE = 1 << 20
+COMMAND_TABLE = bytes.maketrans(b"L", b"-")
+
 
 def parse(it: Iterable[str]) -> Iterable[int]:
     for s in it:
@@ -10,10 +21,39 @@ def parse(it: Iterable[str]) -> Iterable[int]:
         yield int(s)
 
 
+@contextlib.contextmanager
+def map_file(file: str) -> Iterator[mmap.mmap | bytes]:
+    with (open(file, 'rb') as input):
+        if os.fstat(input.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(input.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield data
+
+
+def get_chunk_ranges(data: mmap.mmap | bytes, chunk_size: int = CHUNK_SIZE) -> Iterable[tuple[int, int]]:
+    """Splits the data into byte ranges of roughly chunk_size, each ending after a newline"""
+    start = 0
+    while start < len(data):
+        end = data.find(b"\n", min(start + chunk_size, len(data)) - 1)
+        end = len(data) if end == -1 else end + 1
+        yield start, end
+        start = end
+
+
+def decode_commands(data: bytes) -> array:
+    return array('q', map(int, data.translate(COMMAND_TABLE, b"R").split()))
+
+
+def get_command_chunks(file: str, chunk_size: int = CHUNK_SIZE) -> Iterable[array]:
+    """Decodes the commands straight from the mapped file, one newline-aligned chunk at a time"""
+    with map_file(file) as data:
+        for start, end in get_chunk_ranges(data, chunk_size):
+            yield decode_commands(data[start:end])
+
+
 def get_commands(file: str) -> Iterable[int]:
-    with (open(file) as input):
-        lines = input.readlines()
-    return parse(lines)
+    return chain.from_iterable(get_command_chunks(file))
 
 
 def solve_part_one(dial: int, commands: Iterable[int]) -> tuple[int, int]:
@@ -48,3 +88,76 @@ def solve_part_two(dial: int, commands: Iterable[int]) -> tuple[int, int]:
 
     return dial, jackpots
 
+
+def solve_part_two_batch(dial: int, commands: Iterable[int]) -> tuple[int, int]:
+    """Counts the zero crossings by the hundreds passed on the unwrapped dial, without splitting off full rotations"""
+    jackpots = 0
+
+    for i in commands:
+        position = dial + i
+        if i > 0:
+            # right turns cross zero at each multiple of 100 in (dial, position]
+            jackpots += position // 100 - dial // 100
+        else:
+            # left turns cross zero at each multiple of 100 in [position, dial)
+            jackpots += (dial - 1) // 100 - (position - 1) // 100
+        dial = position
+
+    return dial % 100, jackpots
+
+
+@dataclasses.dataclass(frozen=True)
+class ChunkSummary:
+    offset: int
+    jackpots: tuple[int, ...]  # indexed by the dial the chunk starts at
+
+
+def count_crossings_by_dial(crossings: int, gained: list[int], lost: list[int]) -> list[int]:
+    """Zero crossings of right turns for every starting dial, from those starting at 0 and the remainder histograms"""
+    # starting at dial d pushes a position past the next hundred once its remainder reaches 100 - d
+    by_dial = [crossings]
+    for d in range(1, 100):
+        crossings += gained[100 - d] - lost[100 - d]
+        by_dial.append(crossings)
+    return by_dial
+
+
+def summarize_commands(commands: Iterable[int]) -> ChunkSummary:
+    right_crossings, right_gained, right_lost = 0, [0] * 100, [0] * 100
+    left_crossings, left_gained, left_lost = 0, [0] * 100, [0] * 100
+    position = 0
+
+    for i in commands:
+        end = position + i
+        if i > 0:
+            right_crossings += end // 100 - position // 100
+            right_gained[end % 100] += 1
+            right_lost[position % 100] += 1
+        elif i < 0:
+            # left turns are right turns of the mirrored dial, which starts at -d
+            left_crossings += -end // 100 - -position // 100
+            left_gained[-end % 100] += 1
+            left_lost[-position % 100] += 1
+        position = end
+
+    right = count_crossings_by_dial(right_crossings, right_gained, right_lost)
+    left = count_crossings_by_dial(left_crossings, left_gained, left_lost)
+    return ChunkSummary(position, tuple(r + left[-d % 100] for d, r in enumerate(right)))
+
+
+def summarize_chunk(file: str, chunk_range: tuple[int, int]) -> ChunkSummary:
+    start, end = chunk_range
+    with map_file(file) as data:
+        return summarize_commands(decode_commands(data[start:end]))
+
+
+def solve_part_two_parallel(dial: int, file: str, processes: int | None = None, chunk_size: int = CHUNK_SIZE) -> tuple[int, int]:
+    jackpots = 0
+
+    with multiprocessing.Pool(processes or multiprocessing.cpu_count()) as pool, map_file(file) as data:
+        summaries = pool.imap(partial(summarize_chunk, file), get_chunk_ranges(data, chunk_size))
+        for summary in summaries:
+            jackpots += summary.jackpots[dial]
+            dial = (dial + summary.offset) % 100
+
+    return dial, jackpots
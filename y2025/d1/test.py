@@ -1,7 +1,10 @@
 import os
 import unittest
 
-from y2025.d1.main import solve_part_one, solve_part_two, get_commands
+from more_itertools import flatten
+
+from y2025.d1.main import solve_part_one, solve_part_two, get_commands, solve_part_two_batch, \
+    get_command_chunks, parse, solve_part_two_parallel
 
 TESTDATA_FILENAME = os.path.join(os.path.dirname(__file__), 'input_test.txt')
 
@@ -15,6 +18,18 @@ class Test(unittest.TestCase):
         _, jackpots = solve_part_two(50, get_commands(TESTDATA_FILENAME))
         self.assertEqual(6, jackpots)
 
+    def test_command_chunks(self):
+        with open(TESTDATA_FILENAME) as input:
+            expected = list(parse(input))
+        for chunk_size in (1, 7, 4096):
+            self.assertEqual(expected, list(flatten(get_command_chunks(TESTDATA_FILENAME, chunk_size))))
+
+    def test_part_two_batch(self):
+        self.assertEqual((32, 6), solve_part_two_batch(50, get_commands(TESTDATA_FILENAME)))
+
+    def test_part_two_parallel(self):
+        self.assertEqual((32, 6), solve_part_two_parallel(50, TESTDATA_FILENAME, 2, chunk_size=8))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,14 +1,18 @@
+from __future__ import annotations
+
 import contextlib
 import dataclasses
+import math
 import multiprocessing
 import operator
 import sys
-from functools import reduce
+from fractions import Fraction
+from functools import partial, reduce
 from itertools import combinations_with_replacement, groupby
 from os import PathLike
-from typing import Iterable, Tuple, cast
+from typing import Callable, Iterable, Tuple, cast
 
-from more_itertools import flatten, argmin
+from more_itertools import argmin, chunked, flatten
 from more_itertools.recipes import quantify
 
 from tools.decorators import timeit  # type: ignore
@@ -80,13 +84,63 @@ def parse_inputs(file: PathLike) -> Iterable[MachineInfo]:
             yield MachineInfo(list(parse_buttons(sections[1:-1])), parse_target_state(sections[0]), Joltage(list(parse_button(sections[-1]))))
 
 
-def compute_fewest_button_presses(wiring: Iterable[MachineInfo]) -> int:
+def compute_fewest_button_presses_all_combinations(wiring: Iterable[MachineInfo]) -> int:
     def get_valid_button_presses(target_state: set[int], buttons: list[Button]) -> Iterable[Tuple[Button]]:
         return (comb for comb in all_combinations(buttons) if reduce(operator.xor, comb).v == target_state)
 
     return sum(min(map(len, get_valid_button_presses(info.target_state, info.buttons))) for info in wiring)
 
 
+def get_mask(indices: Iterable[int]) -> int:
+    return sum(1 << i for i in set(indices))
+
+
+def solve_gf2(buttons: list[int], target: int) -> tuple[int, list[int]] | None:
+    """
+    Gauss-Jordan elimination over GF(2) of the lights toggled by the button masks, solutions are masks of pressed buttons.
+    Returns one solution and a basis of the button masks that toggle nothing, None if the target is unreachable
+    """
+    rhs = 1 << len(buttons)
+    lights = max(target.bit_length(), *(b.bit_length() for b in buttons))
+    rows = [sum(1 << j for j, b in enumerate(buttons) if b >> i & 1) | (rhs if target >> i & 1 else 0) for i in range(lights)]
+
+    pivots: list[int] = []
+    for column in range(len(buttons)):
+        bit = 1 << column
+        pivot = next((r for r in range(len(pivots), len(rows)) if rows[r] & bit), None)
+        if pivot is None: continue
+        rank = len(pivots)
+        rows[rank], rows[pivot] = rows[pivot], rows[rank]
+        for r in range(len(rows)):
+            if r != rank and rows[r] & bit:
+                rows[r] ^= rows[rank]
+        pivots.append(column)
+
+    if any(row == rhs for row in rows[len(pivots):]): return None
+
+    solution = sum(1 << column for column, row in zip(pivots, rows) if row & rhs)
+    free_columns = sorted(set(range(len(buttons))) - set(pivots))
+    null_basis = [(1 << f) | sum(1 << column for column, row in zip(pivots, rows) if row >> f & 1) for f in free_columns]
+    return solution, null_basis
+
+
+def get_fewest_presses(buttons: list[int], target: int) -> int:
+    solved = solve_gf2(buttons, target)
+    if solved is None: raise ValueError(f"No button presses reach {target:b}")
+    solution, null_basis = solved
+
+    # walk all the solutions in gray code order, each step adds a single null space vector
+    fewest = solution.bit_count()
+    for i in range(1, 1 << len(null_basis)):
+        solution ^= null_basis[(i & -i).bit_length() - 1]
+        fewest = min(fewest, solution.bit_count())
+    return fewest
+
+
+def compute_fewest_button_presses(wiring: Iterable[MachineInfo]) -> int:
+    return sum(get_fewest_presses([get_mask(b) for b in info.buttons], get_mask(info.target_state)) for info in wiring)
+
+
 # def compute_fewest_joltage_button_presses(wiring: Iterable[MachineInfo]) -> int:
 #     """
 #     Most likely correct, but never finishes...
@@ -134,7 +188,7 @@ class CombinationTracker:
         self.current_comb_len -= len(comb)
 
 
-def compute_fewest_joltage_button_presses(wiring: Iterable[MachineInfo]) -> int:
+def get_fewest_joltage_presses_dfs(info: MachineInfo) -> int:
     def find_leanest_buttons(target_joltage: Joltage, buttons: Iterable[Button]) -> tuple[None, None, None] | tuple[int, list[Button], list[Button]]:
         if target_joltage.is_depleted(): return None, None, None
         min_idx = argmin(quantify(i in b for b in buttons) if target_joltage[i] > 0 else sys.maxsize for i in range(len(target_joltage)))
@@ -171,6 +225,129 @@ def compute_fewest_joltage_button_presses(wiring: Iterable[MachineInfo]) -> int:
         min_comb = cast(tuple[Button, ...], tracker.min_comb)
         return min_comb
 
-    with multiprocessing.Pool(multiprocessing.cpu_count()) as pool:
-        valid_presses = pool.map(len, (get_min_button_presses(info.target_joltage, info.buttons) for info in wiring))
-        return sum(valid_presses)
+    return len(get_min_button_presses(info.target_joltage, info.buttons))
+
+
+def compute_fewest_joltage_button_presses_dfs(wiring: Iterable[MachineInfo], processes: int | None = None) -> int:
+    return compute_fewest_joltage_button_presses_parallel(wiring, get_fewest_joltage_presses_dfs, processes)
+
+
+@dataclasses.dataclass
+class JoltageSystem:
+    """
+    The joltage equations in reduced row echelon form, each pivot button solved for by
+    denominators[i] * x[pivots[i]] = rests[i] - sum(coefficients[i][k] * x[free[k]])
+    """
+    pivots: list[int]
+    free: list[int]
+    denominators: list[int]
+    rests: list[int]
+    coefficients: list[list[int]]
+    caps: list[int]
+
+    @staticmethod
+    def from_machine(info: MachineInfo) -> JoltageSystem:
+        rows = [[Fraction(int(i in b)) for b in info.buttons] + [Fraction(j)] for i, j in enumerate(info.target_joltage)]
+        pivots: list[int] = []
+        for column in range(len(info.buttons)):
+            pivot = next((r for r in range(len(pivots), len(rows)) if rows[r][column] != 0), None)
+            if pivot is None: continue
+            rank = len(pivots)
+            rows[rank], rows[pivot] = rows[pivot], rows[rank]
+            rows[rank] = [v / rows[rank][column] for v in rows[rank]]
+            for r in range(len(rows)):
+                if r != rank and rows[r][column] != 0:
+                    rows[r] = [v - rows[r][column] * w for v, w in zip(rows[r], rows[rank])]
+            pivots.append(column)
+
+        if any(row[-1] != 0 for row in rows[len(pivots):]):
+            raise ValueError(f"No button presses reach {info.target_joltage}")
+
+        free = [c for c in range(len(info.buttons)) if c not in pivots]
+        denominators, rests, coefficients = [], [], []
+        for row in rows[:len(pivots)]:
+            # scaled to integers, the pivot coefficient becomes the denominator
+            scale = math.lcm(*(v.denominator for v in row))
+            denominators.append(scale)
+            rests.append(int(row[-1] * scale))
+            coefficients.append([int(row[f] * scale) for f in free])
+
+        # no button can be pressed more often than the lowest joltage it increases
+        caps = [min(info.target_joltage[i] for i in info.buttons[f]) for f in free]
+        return JoltageSystem(pivots, free, denominators, rests, coefficients, caps)
+
+    def get_fewest_presses(self) -> int:
+        """Branch and bound over the free buttons, narrowing each to the presses that can keep every pivot non-negative"""
+        # the most the free buttons after the k-th can add back to each row
+        slacks = [[sum(max(0, -c) * cap for c, cap in zip(coefficients[k + 1:], self.caps[k + 1:]))
+                   for coefficients in self.coefficients] for k in range(len(self.free))]
+        # the presses of every free button change the total by weights[k] = 1 - sum(coefficients[i][k] / denominators[i])
+        weights: list[Fraction] = [
+            Fraction(1) - sum((Fraction(coefficients[k], d) for coefficients, d in zip(self.coefficients, self.denominators)), Fraction(0))
+            for k in range(len(self.free))]
+        bounds: list[Fraction] = [sum((min(Fraction(0), w) * cap for w, cap in zip(weights[k:], self.caps[k:])), Fraction(0))
+                                  for k in range(len(self.free) + 1)]
+        fewest: Fraction | None = None
+
+        def search(k: int, rests: list[int], presses: Fraction) -> None:
+            nonlocal fewest
+            if fewest is not None and presses + bounds[k] >= fewest: return
+            if k == len(self.free):
+                if all(r >= 0 and r % d == 0 for r, d in zip(rests, self.denominators)):
+                    fewest = presses
+                return
+
+            lowest, highest = 0, self.caps[k]
+            for rest, slack, coefficients in zip(rests, slacks[k], self.coefficients):
+                c = coefficients[k]
+                if c > 0:
+                    highest = min(highest, (rest + slack) // c)
+                elif c < 0:
+                    lowest = max(lowest, -((rest + slack) // -c))
+                elif rest + slack < 0:
+                    return
+
+            for x in range(lowest, highest + 1):
+                search(k + 1, [r - x * coefficients[k] for r, coefficients in zip(rests, self.coefficients)], presses + weights[k] * x)
+
+        search(0, self.rests, sum((Fraction(r, d) for r, d in zip(self.rests, self.denominators)), Fraction(0)))
+        if fewest is None: raise ValueError("No button presses reach the joltage")
+        return int(fewest)
+
+
+def get_fewest_joltage_presses(info: MachineInfo) -> int:
+    return JoltageSystem.from_machine(info).get_fewest_presses()
+
+
+def compute_fewest_joltage_button_presses(wiring: Iterable[MachineInfo]) -> int:
+    return sum(map(get_fewest_joltage_presses, wiring))
+
+
+def get_machine_size(info: MachineInfo) -> tuple[int, int]:
+    return len(info.buttons), max(info.target_joltage)
+
+
+def solve_machines(solve: Callable[[MachineInfo], int], machines: list[MachineInfo]) -> tuple[int, int]:
+    return len(machines), sum(map(solve, machines))
+
+
+def compute_fewest_joltage_button_presses_parallel(wiring: Iterable[MachineInfo], solve: Callable[[MachineInfo], int] = get_fewest_joltage_presses,
+                                                   processes: int | None = None, chunk_size: int = 1, timeout: float | None = None,
+                                                   progress: Callable[[int, int], None] | None = None) -> int:
+    """
+    Solves chunks of machines in worker processes, the largest machines first so none is left running alone at the end.
+    Waits timeout seconds per machine in a chunk for the next chunk to be solved, then raises multiprocessing.TimeoutError;
+    progress is called with the count of machines solved so far and of all machines
+    """
+    machines = sorted(wiring, key=get_machine_size, reverse=True)
+    chunk_timeout = None if timeout is None else timeout * chunk_size
+    done, total = 0, 0
+
+    with multiprocessing.Pool(processes or multiprocessing.cpu_count()) as pool:
+        results = pool.imap_unordered(partial(solve_machines, solve), chunked(machines, chunk_size))
+        while done < len(machines):
+            count, presses = results.next(chunk_timeout)
+            done, total = done + count, total + presses
+            if progress: progress(done, len(machines))
+
+    return total
@@ -4,7 +4,9 @@ import unittest
 from tools.mypyc import ensure_built
 
 ensure_built()
-from y2025.d10.main import compute_fewest_button_presses, parse_inputs, compute_fewest_joltage_button_presses
+from y2025.d10.main import compute_fewest_button_presses, parse_inputs, compute_fewest_joltage_button_presses, \
+    compute_fewest_button_presses_all_combinations, get_fewest_presses, compute_fewest_joltage_button_presses_dfs, \
+    compute_fewest_joltage_button_presses_parallel
 
 TESTDATA_FILENAME = os.path.join(os.path.dirname(__file__), 'input_test.txt')
 LIVE_FILENAME = os.path.join(os.path.dirname(__file__), 'input.txt')
@@ -29,9 +31,29 @@ class Test(unittest.TestCase):
     def test_part_one_live(self):
         self.assertEqual(399, solve_part_one(LIVE_FILENAME))
 
+    def test_part_one_all_combinations(self):
+        self.assertEqual(7, compute_fewest_button_presses_all_combinations(parse_inputs(TESTDATA_FILENAME)))
+
+    def test_fewest_presses_wide(self):
+        # 32 buttons each toggling a single light, and pairs of them toggled together by 8 more
+        buttons = [1 << i for i in range(32)] + [0b11 << i for i in range(0, 16, 2)]
+        self.assertEqual(12, get_fewest_presses(buttons, (1 << 20) - 1))
+        with self.assertRaises(ValueError):
+            get_fewest_presses(buttons, 1 << 32)
+
     def test_part_two(self):
         self.assertEqual(33, solve_part_two(TESTDATA_FILENAME))
 
+    def test_part_two_dfs(self):
+        self.assertEqual(33, compute_fewest_joltage_button_presses_dfs(parse_inputs(TESTDATA_FILENAME), processes=2))
+
+    def test_part_two_parallel(self):
+        progress = []
+        total = compute_fewest_joltage_button_presses_parallel(parse_inputs(LIVE_FILENAME), processes=2, chunk_size=8, timeout=10,
+                                                               progress=lambda done, machines: progress.append((done, machines)))
+        self.assertEqual(15631, total)
+        self.assertEqual((157, 157), progress[-1])
+
     def test_part_two_live(self):
         self.assertEqual(15631, solve_part_two(LIVE_FILENAME))
 
@@ -1,8 +1,13 @@
-from typing import Iterable, Tuple
+import heapq
+import math
+from itertools import combinations
+from typing import Callable, Iterable, Tuple
 from io import open
 
 import csv
 
+from more_itertools import unique_justseen
+
 
 def parse(s: str) -> Tuple[int, int]:
     vals = s.split("-", 2)
@@ -26,9 +31,7 @@ def is_invalid(i: int) -> bool:
 
 def solve_part_one(ranges: Iterable[Tuple[int, int]]) -> Iterable[int]:
     for lower, upper in ranges:
-        for i in range(lower, upper + 1):
-            if is_invalid(i):
-                yield i
+        yield from get_invalid_ids(lower, upper, repeated=False)
 
 
 def is_invalid_repeated(i: int) -> bool:
@@ -42,8 +45,66 @@ def is_invalid_repeated(i: int) -> bool:
 
     return False
 
+def get_block_lengths(digits: int, repeated: bool) -> list[int]:
+    if repeated:
+        return [b for b in range(1, digits // 2 + 1) if digits % b == 0]
+    return [digits // 2] if digits % 2 == 0 else []
+
+
+def get_repeat_multiplier(digits: int, block: int) -> int:
+    """Multiplier that repeats a block of given length to fill the digits, e.g. 10101 for 2 -> 6"""
+    return (10 ** digits - 1) // (10 ** block - 1)
+
+
+def get_digit_spans(lower: int, upper: int) -> Iterable[Tuple[int, int, int]]:
+    """Splits [lower, upper] into (digits, first, last) parts sharing the same digit count"""
+    for digits in range(len(str(lower)), len(str(upper)) + 1):
+        yield digits, max(lower, 10 ** (digits - 1)), min(upper, 10 ** digits - 1)
+
+
+def get_invalid_ids(lower: int, upper: int, repeated: bool) -> Iterable[int]:
+    """Builds the invalid ids in [lower, upper] in ascending order, without testing the ids in between"""
+    for digits, first, last in get_digit_spans(lower, upper):
+        streams = []
+        for block in get_block_lengths(digits, repeated):
+            mult = get_repeat_multiplier(digits, block)
+            blocks_from, blocks_to = -(-first // mult), last // mult
+            streams.append(range(blocks_from * mult, blocks_to * mult + 1, mult))
+        # ids with a shorter period are produced by every block length that is a multiple of it
+        yield from unique_justseen(heapq.merge(*streams))
+
+
 def solve_part_two(ranges: Iterable[Tuple[int, int]]) -> Iterable[int]:
     for lower, upper in ranges:
-        for i in range(lower, upper + 1):
-            if is_invalid_repeated(i):
-                yield i
+        yield from get_invalid_ids(lower, upper, repeated=True)
+
+
+def get_block_signs(digits: int, repeated: bool) -> list[Tuple[int, int]]:
+    """Block lengths with their inclusion-exclusion sign, so that every invalid id is counted once"""
+    if not repeated:
+        return [(digits // 2, 1)] if digits % 2 == 0 else []
+
+    # ids repeating a block of length b also repeat blocks of every multiple of b dividing the digits,
+    # so it is enough to combine the maximal blocks digits / p over the prime factors p
+    primes = [p for p in range(2, digits + 1) if digits % p == 0 and all(p % q for q in range(2, p))]
+    return [(digits // math.prod(comb), (-1) ** (k + 1)) for k in range(1, len(primes) + 1) for comb in combinations(primes, k)]
+
+
+def aggregate_invalid(ranges: Iterable[Tuple[int, int]], repeated: bool, series: Callable[[int, int, int], int]) -> int:
+    total = 0
+    for lower, upper in ranges:
+        for digits, first, last in get_digit_spans(lower, upper):
+            for block, sign in get_block_signs(digits, repeated):
+                mult = get_repeat_multiplier(digits, block)
+                blocks_from, blocks_to = -(-first // mult), last // mult
+                if blocks_from <= blocks_to:
+                    total += sign * series(mult, blocks_from, blocks_to)
+    return total
+
+
+def count_invalid(ranges: Iterable[Tuple[int, int]], *, repeated: bool = False) -> int:
+    return aggregate_invalid(ranges, repeated, lambda mult, first, last: last - first + 1)
+
+
+def sum_invalid(ranges: Iterable[Tuple[int, int]], *, repeated: bool = False) -> int:
+    return aggregate_invalid(ranges, repeated, lambda mult, first, last: mult * (first + last) * (last - first + 1) // 2)
@@ -1,9 +1,11 @@
 import os
 import unittest
 
-from y2025.d2.main import solve_part_one, solve_part_two, get_ranges
+from y2025.d2.main import solve_part_one, solve_part_two, get_ranges, get_invalid_ids, is_invalid, is_invalid_repeated, \
+    count_invalid, sum_invalid
 
 TESTDATA_FILENAME = os.path.join(os.path.dirname(__file__), 'input_test.txt')
+LIVE_FILENAME = os.path.join(os.path.dirname(__file__), 'input.txt')
 
 
 class Test(unittest.TestCase):
@@ -19,6 +21,26 @@ class Test(unittest.TestCase):
         # print(list(invalid_ids))
         self.assertEqual(4174379265, sum(invalid_ids))
 
+    def test_part_one_live(self):
+        self.assertEqual(41294979841, sum(solve_part_one(get_ranges(LIVE_FILENAME))))
+
+    def test_part_two_live(self):
+        self.assertEqual(66500947346, sum(solve_part_two(get_ranges(LIVE_FILENAME))))
+
+    def test_sum_invalid(self):
+        self.assertEqual(1227775554, sum_invalid(get_ranges(TESTDATA_FILENAME)))
+        self.assertEqual(4174379265, sum_invalid(get_ranges(TESTDATA_FILENAME), repeated=True))
+
+    def test_count_invalid(self):
+        for repeated, solve in ((False, solve_part_one), (True, solve_part_two)):
+            expected = len(list(solve(get_ranges(LIVE_FILENAME))))
+            self.assertEqual(expected, count_invalid(get_ranges(LIVE_FILENAME), repeated=repeated))
+
+    def test_invalid_ids_match_string_checks(self):
+        for lower, upper in ((1, 1200), (95, 115), (99990, 123500)):
+            self.assertEqual([i for i in range(lower, upper + 1) if is_invalid(i)], list(get_invalid_ids(lower, upper, False)))
+            self.assertEqual([i for i in range(lower, upper + 1) if is_invalid_repeated(i)], list(get_invalid_ids(lower, upper, True)))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,7 +1,8 @@
 from collections import deque
+from dataclasses import dataclass
 from functools import reduce
 from os import PathLike
-from typing import Iterable
+from typing import Iterable, Sequence
 from io import open
 
 
@@ -36,7 +37,46 @@ def find_n_maxes(battery: list[int], batteries: int) -> Iterable[int]:
     return maxes
 
 
+def select_n_maxes(battery: Sequence[int], batteries: int) -> list[int]:
+    """Largest subsequence of given length, kept as a monotonic stack in a single pass"""
+    drops = len(battery) - batteries
+    maxes: list[int] = []
+    for v in battery:
+        while drops > 0 and maxes and maxes[-1] < v:
+            maxes.pop()
+            drops -= 1
+        maxes.append(v)
+    return maxes[:batteries]
+
+
 def solve(inputs: Iterable[list[int]], batteries: int) -> Iterable[int]:
     for battery in inputs:
-        maxes = find_n_maxes(battery, batteries)
+        maxes = select_n_maxes(battery, batteries)
         yield reduce(lambda total, v: total * 10 + v, maxes, 0)
+
+
+@dataclass
+class DigitMatrix:
+    data: bytes
+    rows: int
+    columns: int
+
+    def row(self, i: int) -> memoryview:
+        start = i * (self.columns + 1)
+        return memoryview(self.data)[start:start + self.columns]
+
+
+def get_digit_matrix(file: PathLike[str]) -> DigitMatrix:
+    """Loads all banks as one byte buffer of digit characters, rows separated by a newline"""
+    with (open(file, 'rb') as input):
+        data = input.read()
+    columns = data.find(b"\n")
+    if columns == -1:
+        columns = len(data)
+    return DigitMatrix(data, (len(data) + 1) // (columns + 1), columns)
+
+
+def solve_batched(matrix: DigitMatrix, batteries: int) -> Iterable[int]:
+    for i in range(matrix.rows):
+        # digit characters order the same way as the digits, so the selection works on the raw bytes
+        yield int(bytes(select_n_maxes(matrix.row(i), batteries)))
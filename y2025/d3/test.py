@@ -2,9 +2,10 @@ import os
 import pathlib
 import unittest
 
-from y2025.d3.main import solve, get_lines
+from y2025.d3.main import solve, get_lines, solve_batched, get_digit_matrix
 
 TESTDATA_FILENAME = pathlib.Path(os.path.join(os.path.dirname(__file__), 'input_test.txt'))
+LIVE_FILENAME = pathlib.Path(os.path.join(os.path.dirname(__file__), 'input.txt'))
 
 
 class Test(unittest.TestCase):
@@ -20,6 +21,14 @@ class Test(unittest.TestCase):
         # print(list(maxes))
         self.assertEqual(3121910778619, sum(maxes))
 
+    def test_part_two_batched(self):
+        maxes = solve_batched(get_digit_matrix(TESTDATA_FILENAME), 12)
+        self.assertEqual(3121910778619, sum(maxes))
+
+    def test_part_two_live(self):
+        self.assertEqual(170520923035051, sum(solve(get_lines(LIVE_FILENAME), 12)))
+        self.assertEqual(170520923035051, sum(solve_batched(get_digit_matrix(LIVE_FILENAME), 12)))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,7 +1,13 @@
+import multiprocessing
+from collections import deque
 from dataclasses import dataclass
 from io import open
+from itertools import accumulate, chain
+from operator import add, sub
 from os import PathLike
-from typing import Iterable
+from multiprocessing import shared_memory
+from multiprocessing.synchronize import Barrier
+from typing import Iterable, cast
 
 from more_itertools import quantify
 
@@ -29,36 +35,168 @@ def get_counts_around(row: int, col: int, inputs: list[list[bool]], neighbours_c
     return total - 1
 
 
-@dataclass
-class RollInfo:
-    i: int
-    j: int
-    neighbours: int
+def get_summed_area_table(inputs: list[list[bool]]) -> list[list[int]]:
+    """table[i][j] is the number of rolls above and to the left of (i, j), exclusive"""
+    table = [[0] * (len(inputs[0]) + 1)] if inputs else []
+    for row in inputs:
+        table.append(list(map(add, table[-1], accumulate(row, initial=0))))
+    return table
 
 
-def find_all_counts(inputs: list[list[bool]], neighbours_count: int) -> Iterable[RollInfo]:
+def get_neighbour_counts(inputs: list[list[bool]], neighbours_count: int) -> list[list[int]]:
+    """Same counts as get_counts_around for the whole grid, in time independent of the neighbourhood size"""
+    if not inputs:
+        return []
+
+    table = get_summed_area_table(inputs)
+    cols = len(inputs[0])
+    lefts = [max(0, j - neighbours_count) for j in range(cols)]
+    rights = [min(cols, j + neighbours_count + 1) for j in range(cols)]
+    counts = []
+
     for i, row in enumerate(inputs):
-        for j, col in enumerate(row):
-            yield RollInfo(i, j, get_counts_around(i, j, inputs, neighbours_count))
+        column_sums = list(map(sub, table[min(len(inputs), i + neighbours_count + 1)], table[max(0, i - neighbours_count)]))
+        boxes = map(sub, map(column_sums.__getitem__, rights), map(column_sums.__getitem__, lefts))
+        counts.append([box - 1 if roll else -1 for box, roll in zip(boxes, row)])
+
+    return counts
 
 
 def solve_part_one(inputs: list[list[bool]], neighbours_count: int, count_limit: int) -> int:
-    counts = find_all_counts(inputs, neighbours_count)
-    return quantify(counts, lambda info: 0 <= info.neighbours <= count_limit)
+    counts = get_neighbour_counts(inputs, neighbours_count)
+    return quantify(chain.from_iterable(counts), lambda count: 0 <= count <= count_limit)
 
 
 def solve_part_two(inputs: list[list[bool]], neighbours_count: int, count_limit: int) -> int:
+    counts = get_neighbour_counts(inputs, neighbours_count)
+    removable = deque((i, j) for i, row in enumerate(counts) for j, count in enumerate(row) if 0 <= count <= count_limit)
     total = 0
 
-    while True:
-        counts = find_all_counts(inputs, neighbours_count)
-        new_count = 0
-
-        for info in counts:
-            if 0 <= info.neighbours <= count_limit:
-                inputs[info.i][info.j] = False
-                new_count += 1
-
-        total += new_count
-        if new_count == 0:
-            return total
+    while removable:
+        i, j = removable.popleft()
+        inputs[i][j] = False
+        total += 1
+
+        for row in range(max(0, i - neighbours_count), min(len(inputs), i + neighbours_count + 1)):
+            for col in range(max(0, j - neighbours_count), min(len(inputs[row]), j + neighbours_count + 1)):
+                if not inputs[row][col]: continue
+                counts[row][col] -= 1
+                # rolls already below the limit are queued, so only the one crossing it needs queueing
+                if counts[row][col] == count_limit:
+                    removable.append((row, col))
+
+    return total
+
+
+@dataclass(frozen=True)
+class StripeJob:
+    grid_name: str
+    rows: int
+    cols: int
+    start: int
+    end: int
+    index: int
+    neighbours_count: int
+    count_limit: int
+    outbox_size: int
+
+
+def remove_stripe_rolls(job: StripeJob, barrier: Barrier, outboxes, published, totals) -> None:
+    """
+    Peels rows [start, end) of the shared grid as solve_part_two does, in lockstep waves with the other stripes.
+    Removals near the stripe edges go to the stripe's outbox, and the other stripes apply them after each wave
+    """
+    grid = shared_memory.SharedMemory(job.grid_name)
+    try:
+        buf = cast(memoryview, grid.buf)
+        r, cols, start, end = job.neighbours_count, job.cols, job.start, job.end
+        top, bottom = max(0, start - r), min(job.rows, end + r)
+        # the halo rows of the neighbouring stripes are only needed to count once
+        rows = [list(map(bool, buf[i * cols:(i + 1) * cols])) for i in range(top, bottom)]
+        counts = get_neighbour_counts(rows, r)[start - top:end - top]
+        removable = deque((i, j) for i, row in enumerate(counts, start) for j, count in enumerate(row) if 0 <= count <= job.count_limit)
+        barrier.wait()  # every stripe has counted its rolls, the grid can change
+
+        def remove_around(i: int, j: int) -> None:
+            for row in range(max(start, i - r), min(end, i + r + 1)):
+                row_counts = counts[row - start]
+                for col in range(max(0, j - r), min(cols, j + r + 1)):
+                    if row_counts[col] < 0: continue
+                    row_counts[col] -= 1
+                    if row_counts[col] == job.count_limit:
+                        removable.append((row, col))
+
+        outbox = job.index * job.outbox_size
+        sent, seen = 0, [0] * len(published)
+        total = 0
+
+        while True:
+            while removable:
+                i, j = removable.popleft()
+                buf[i * cols + j] = 0
+                counts[i - start][j] = -1
+                total += 1
+                if (start > 0 and i - r < start) or (end < job.rows and i + r >= end):
+                    outboxes[outbox + sent] = i * cols + j
+                    sent += 1
+                remove_around(i, j)
+
+            published[job.index] = sent
+            barrier.wait()  # every stripe has published this wave's removals
+            received = list(published)
+            barrier.wait()  # every stripe has read the published counts
+            if received == seen:
+                break
+
+            for k, (first, last) in enumerate(zip(seen, received)):
+                if k == job.index: continue
+                for idx in outboxes[k * job.outbox_size + first:k * job.outbox_size + last]:
+                    i, j = divmod(idx, cols)
+                    if start - r <= i < end + r:
+                        remove_around(i, j)
+            seen = received
+
+        totals[job.index] = total
+    except BaseException:
+        barrier.abort()
+        raise
+    finally:
+        grid.close()
+
+
+def solve_part_two_parallel(inputs: list[list[bool]], neighbours_count: int, count_limit: int, processes: int | None = None) -> int:
+    if not inputs:
+        return 0
+
+    rows, cols = len(inputs), len(inputs[0])
+    processes = min(processes or multiprocessing.cpu_count(), rows)
+    grid = shared_memory.SharedMemory(create=True, size=max(1, rows * cols))
+    try:
+        buf = cast(memoryview, grid.buf)
+        for i, row in enumerate(inputs):
+            buf[i * cols:(i + 1) * cols] = bytes(row)
+
+        bounds = [rows * k // processes for k in range(processes + 1)]
+        # only the rolls within reach of another stripe are sent to it
+        outbox_size = min(max(map(sub, bounds[1:], bounds[:-1])), 2 * neighbours_count) * cols
+        barrier = multiprocessing.Barrier(processes)
+        outboxes = multiprocessing.RawArray('q', max(1, processes * outbox_size))
+        published = multiprocessing.RawArray('q', processes)
+        totals = multiprocessing.RawArray('q', processes)
+        workers = [multiprocessing.Process(target=remove_stripe_rolls, args=(
+            StripeJob(grid.name, rows, cols, bounds[k], bounds[k + 1], k, neighbours_count, count_limit, outbox_size),
+            barrier, outboxes, published, totals)) for k in range(processes)]
+
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        if any(worker.exitcode != 0 for worker in workers):
+            raise RuntimeError(f"Stripe workers failed: {[worker.exitcode for worker in workers]}")
+
+        for i, row in enumerate(inputs):
+            row[:] = map(bool, buf[i * cols:(i + 1) * cols])
+        return sum(totals)
+    finally:
+        grid.close()
+        grid.unlink()
@@ -2,9 +2,11 @@ import os
 import pathlib
 import unittest
 
-from y2025.d4.main import solve_part_one, get_lines, solve_part_two
+from y2025.d4.main import solve_part_one, get_lines, solve_part_two, get_neighbour_counts, get_counts_around, \
+    solve_part_two_parallel
 
 TESTDATA_FILENAME = pathlib.Path(os.path.join(os.path.dirname(__file__), 'input_test.txt'))
+LIVE_FILENAME = pathlib.Path(os.path.join(os.path.dirname(__file__), 'input.txt'))
 
 
 class Test(unittest.TestCase):
@@ -20,6 +22,23 @@ class Test(unittest.TestCase):
         # print(list(maxes))
         self.assertEqual(43, rolls)
 
+    def test_part_two_parallel(self):
+        inputs = get_lines(TESTDATA_FILENAME)
+        rolls = solve_part_two_parallel(list(inputs), 1, 3, processes=3)
+        self.assertEqual(43, rolls)
+
+    def test_neighbour_counts(self):
+        inputs = list(get_lines(TESTDATA_FILENAME))
+        for neighbours_count in (1, 2, 20):
+            expected = [[get_counts_around(i, j, inputs, neighbours_count) for j in range(len(row))] for i, row in enumerate(inputs)]
+            self.assertEqual(expected, get_neighbour_counts(inputs, neighbours_count))
+
+    def test_part_two_live(self):
+        inputs = get_lines(LIVE_FILENAME)
+        rolls = solve_part_two(list(inputs), 1, 3)
+        self.assertEqual(9609, rolls)
+        self.assertEqual(9609, solve_part_two_parallel(list(get_lines(LIVE_FILENAME)), 1, 3, processes=4))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,14 @@
-from dataclasses import dataclass
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from functools import cached_property
 from io import open
+from itertools import chain, repeat, tee
+from operator import le
 from os import PathLike
+from typing import Iterable, Iterator, Sequence
 
 
 @dataclass
@@ -37,17 +45,16 @@ def is_overlap_sorted(smaller: Range, latter: Range) -> bool:
 
 
 def merge_ranges(ranges: list[Range]) -> list[Range]:
-    ranges.sort(key=lambda r: r.lower)
-    ranges_iter = iter(ranges)
-    merged_ranges = [next(ranges_iter)]
+    sorted_ranges = sorted(ranges, key=lambda r: r.lower)
+    merged_ranges = [Range(sorted_ranges[0].lower, sorted_ranges[0].upper)]
 
-    for range in ranges:
+    for range in sorted_ranges:
         last_range = merged_ranges[-1]
 
         if is_overlap_sorted(last_range, range):
-            merged_ranges[-1].upper = max(last_range.upper, range.upper)
+            last_range.upper = max(last_range.upper, range.upper)
         else:
-            merged_ranges.append(range)
+            merged_ranges.append(Range(range.lower, range.upper))
 
     return merged_ranges
 
@@ -71,9 +78,77 @@ def count_fresh_ids(merged_ranges: list[Range], ids: list[int]) -> int:
     return fresh_count
 
 
-def solve_part_one(ranges: list[Range], ids: list[int]) -> int:
-    merged_ranges = merge_ranges(ranges)
-    return count_fresh_ids(merged_ranges, ids)
+@dataclass(frozen=True)
+class RangeIndex:
+    """Merged ranges as flat sorted arrays of their bounds"""
+    lowers: array
+    uppers: array
+
+    @staticmethod
+    def from_ranges(ranges: list[Range]) -> RangeIndex:
+        merged_ranges = merge_ranges(ranges)
+        return RangeIndex(array('q', (r.lower for r in merged_ranges)), array('q', (r.upper for r in merged_ranges)))
+
+    @cached_property
+    def uppers_before(self) -> array:
+        # indexed by bisect position, position 0 lying before every range
+        return array('q', chain((-2 ** 63,), self.uppers))
+
+    def contains(self, id: int) -> bool:
+        return id <= self.uppers_before[bisect_right(self.lowers, id)]
+
+    def contained(self, ids: Iterable[int]) -> Iterator[bool]:
+        ids, lookup_ids = tee(ids)
+        positions = map(bisect_right, repeat(self.lowers), lookup_ids)
+        return map(le, ids, map(self.uppers_before.__getitem__, positions))
+
+    def contains_batch(self, ids: Sequence[int]) -> list[bool]:
+        return list(self.contained(ids))
+
+    def count_fresh(self, ids: Iterable[int]) -> int:
+        """Streams the ids once, without materializing or sorting them"""
+        return sum(self.contained(ids))
+
+
+@dataclass
+class RangeSet:
+    """Disjoint sorted ranges, merged as new ranges are added"""
+    lowers: list[int] = field(default_factory=list)
+    uppers: list[int] = field(default_factory=list)
+    covered: int = 0
+
+    @staticmethod
+    def from_ranges(ranges: Iterable[Range]) -> RangeSet:
+        range_set = RangeSet()
+        for range in ranges:
+            range_set.add_range(range)
+        return range_set
+
+    def add_range(self, range: Range) -> None:
+        lower, upper = range.lower, range.upper
+        # stored ranges in [start, end) end at or after the new lower bound and start at or before the new upper bound
+        start = bisect_left(self.uppers, lower)
+        end = bisect_right(self.lowers, upper)
+
+        if start < end:
+            lower = min(lower, self.lowers[start])
+            upper = max(upper, self.uppers[end - 1])
+            self.covered -= sum(self.uppers[start:end]) - sum(self.lowers[start:end]) + end - start
+
+        self.lowers[start:end] = [lower]
+        self.uppers[start:end] = [upper]
+        self.covered += upper - lower + 1
+
+    def contains(self, id: int) -> bool:
+        i = bisect_right(self.lowers, id)
+        return i > 0 and id <= self.uppers[i - 1]
+
+    def total_covered(self) -> int:
+        return self.covered
+
+
+def solve_part_one(ranges: list[Range], ids: Iterable[int]) -> int:
+    return RangeIndex.from_ranges(ranges).count_fresh(ids)
 
 
 def solve_part_two(ranges: list[Range]) -> int:
@@ -1,9 +1,10 @@
 import os
 import unittest
 
-from y2025.d5.main import solve_part_one, solve_part_two, get_ranges_and_ids
+from y2025.d5.main import solve_part_one, solve_part_two, get_ranges_and_ids, RangeIndex, RangeSet, Range
 
 TESTDATA_FILENAME = os.path.join(os.path.dirname(__file__), 'input_test.txt')
+LIVE_FILENAME = os.path.join(os.path.dirname(__file__), 'input.txt')
 
 
 class Test(unittest.TestCase):
@@ -19,6 +20,33 @@ class Test(unittest.TestCase):
         # print(list(invalid_ids))
         self.assertEqual(14, fresh_ids)
 
+    def test_part_one_live(self):
+        ranges, ids = get_ranges_and_ids(LIVE_FILENAME)
+        self.assertEqual(773, solve_part_one(ranges, iter(ids)))
+
+    def test_part_two_live(self):
+        ranges, _ = get_ranges_and_ids(LIVE_FILENAME)
+        self.assertEqual(332067203034711, solve_part_two(ranges))
+
+    def test_range_set(self):
+        ranges, ids = get_ranges_and_ids(TESTDATA_FILENAME)
+        range_set = RangeSet()
+        for range, covered in zip(ranges, (3, 8, 13, 14)):
+            range_set.add_range(range)
+            self.assertEqual(covered, range_set.total_covered())
+        self.assertEqual([False, True, False, True, True, False], [range_set.contains(id) for id in ids])
+        range_set.add_range(Range(1, 30))
+        self.assertEqual(30, range_set.total_covered())
+        self.assertEqual(([3, 10, 16, 12], [5, 14, 20, 18]), ([r.lower for r in ranges], [r.upper for r in ranges]))
+
+    def test_range_index(self):
+        ranges, ids = get_ranges_and_ids(TESTDATA_FILENAME)
+        index = RangeIndex.from_ranges(ranges)
+        expected = [False, True, False, True, True, False]
+        self.assertEqual(expected, index.contains_batch(ids))
+        self.assertEqual(expected, [index.contains(id) for id in ids])
+        self.assertEqual(3, index.count_fresh(iter(ids)))
+
 
 if __name__ == "__main__":
     unittest.main()
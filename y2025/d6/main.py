@@ -1,13 +1,18 @@
+import contextlib
 import dataclasses
+import math
+import mmap
 import operator
+from functools import reduce
 from io import open
-from itertools import filterfalse
+from itertools import chain, compress, filterfalse
 from os import PathLike
-from typing import Callable, Iterable, TypeVar
+from typing import Any, Callable, Iterable, Iterator, TypeVar, cast
 
 from more_itertools.more import peekable
 
 from tools.file import read_last_line
+from tools.itertools import filter_none
 
 T = TypeVar('T')
 TVal = TypeVar('TVal')
@@ -28,6 +33,13 @@ ops_templates: dict[str, Op] = {
     '*': Op(operator.mul, 1),
 }
 
+# whole-column reductions by operator with its identity, only ops defaulting to it may skip their empty cells
+bulk_reducers: dict[Callable, tuple[int, Callable[[Iterable[int]], int]]] = {
+    operator.add: (0, sum),
+    operator.sub: (0, lambda values: -sum(values)),
+    operator.mul: (1, math.prod),
+}
+
 
 def parse_lists_and_ops(file: PathLike[str]) -> tuple[list[Op], Iterable[list[int]]]:
     def parse_ops(file: PathLike[str]) -> list[Op]:
@@ -96,9 +108,53 @@ def parse_lists_and_ops_columns(file: PathLike[str]) -> tuple[list[Op], list[int
     return ops, transposed_inputs
 
 
+@contextlib.contextmanager
+def map_worksheet(file: PathLike[str]) -> Iterator[tuple[mmap.mmap, int, int]]:
+    """Maps the worksheet, yielding it with the start and the end of the operator row"""
+    with (open(file, 'rb') as input, mmap.mmap(input.fileno(), 0, access=mmap.ACCESS_READ) as data):
+        end = len(data)
+        while end > 0 and data[end - 1:end] == b"\n":
+            end -= 1
+        yield data, data.rfind(b"\n", 0, end) + 1, end
+
+
+def parse_ops_row(line: bytes) -> list[Op | None]:
+    """Same as parse_lists_and_ops_columns: each operator spans its columns, the column before it is None"""
+    parsed_ops: list[Op | None] = []
+    op: Op | None = None
+    for i, c in enumerate(line.decode()):
+        if c != " ":
+            op_template = ops_templates[c]
+            op = Op(op_template.func, op_template.default, op.idx + 1 if op else 0)
+            if i > 0:
+                parsed_ops[i - 1] = None
+        parsed_ops.append(op)
+    return parsed_ops
+
+
+def parse_lists_and_ops_mapped(file: PathLike[str]) -> tuple[list[Op], list[list[int]]]:
+    with map_worksheet(file) as (data, ops_start, end):
+        templates = map(lambda op: ops_templates[op], data[ops_start:end].decode().split())
+        ops = [Op(op.func, op.default, i) for i, op in enumerate(templates)]
+        inputs = [list(map(int, row.split())) for row in data[:ops_start].splitlines()]
+    return ops, inputs
+
+
+def parse_lists_and_ops_columns_mapped(file: PathLike[str]) -> tuple[list[Op | None], list[int]]:
+    with map_worksheet(file) as (data, ops_start, end):
+        stride = data.find(b"\n") + 1
+        ops = parse_ops_row(data[ops_start:end])
+        # a strided slice reads one whole column top to bottom, blank columns count as 0 like add_digit does
+        transposed_inputs = [int(data[i:ops_start:stride].translate(None, b" ") or b"0") for i in range(stride - 1)]
+    return ops, transposed_inputs
+
+
+def get_empty_totals(ops: list[Op | None]) -> list[Any]:
+    return [None] * (max(map(operator.attrgetter('idx'), filter(None, ops)), default=-1) + 1)
+
+
 def parallel_map_ops(ops: list[Op | None], inputs: Iterable[list[TVal]]) -> list[TVal]:
-    totals_count = max(ops, key=lambda op: -1 if op is None else op.idx).idx + 1
-    totals = [None] * totals_count
+    totals = get_empty_totals(ops)
 
     for input in inputs:
         for op, val in zip(ops, input):
@@ -113,5 +169,48 @@ def parallel_map_ops(ops: list[Op | None], inputs: Iterable[list[TVal]]) -> list
     return totals
 
 
-def compute_totals_sum(ops: list[Op | None], inputs: Iterable[list[int]]) -> int:
-    return sum(parallel_map_ops(ops, inputs))
+def get_op_spans(ops: list[Op | None]) -> tuple[list[Op], list[int], list[int]]:
+    """The operators in column order with the [start, end) range of the columns of each"""
+    starts = [col for col, (previous, op) in enumerate(zip([None, *ops], ops)) if op and (not previous or previous.idx != op.idx)]
+    ends = [col + 1 for col, (op, following) in enumerate(zip(ops, [*ops[1:], None])) if op and (not following or following.idx != op.idx)]
+    return [cast(Op, ops[start]) for start in starts], starts, ends
+
+
+def reduce_op_groups(ops: list[Op | None], inputs: Iterable[list[TVal]]) -> list[TVal]:
+    """Same totals as parallel_map_ops, reducing the column slices of all the operators of a kind in bulk calls"""
+    rows = list(inputs)
+    span_ops, starts, ends = get_op_spans(ops)
+    if len({op.idx for op in span_ops}) != len(span_ops):
+        return parallel_map_ops(ops, rows)  # the columns of an operator are not contiguous
+
+    totals = get_empty_totals(ops)
+    if not rows:
+        return totals
+
+    columns = list(zip(*rows))
+    if len(span_ops) == len(columns):
+        groups = columns  # every column is an operator of its own
+    else:
+        groups = [tuple(chain.from_iterable(columns[start:end])) for start, end in zip(starts, ends)]
+    has_none = None in chain.from_iterable(groups)
+    kinds = [op.func if op.default == bulk_reducers.get(op.func, (None,))[0] else None for op in span_ops]
+
+    for func, (_, reducer) in bulk_reducers.items():
+        selected = [kind is func for kind in kinds]
+        selected_groups = compress(groups, selected)
+        if has_none:
+            selected_groups = (tuple(filter_none(group)) for group in selected_groups)
+        for op, total in zip(compress(span_ops, selected), map(reducer, selected_groups)):
+            totals[op.idx] = total
+
+    for k in compress(range(len(kinds)), map(operator.not_, kinds)):
+        op = span_ops[k]
+        values = chain.from_iterable(zip(*columns[starts[k]:ends[k]]))  # row by row, as parallel_map_ops folds them
+        totals[op.idx] = reduce(op.func, (op.default if val is None else val for val in values), op.default)
+
+    return totals
+
+
+def compute_totals_sum(ops: list[Op | None], inputs: Iterable[list[int]],
+                       map_ops: Callable[[list[Op | None], Iterable[list[int]]], list[int]] = parallel_map_ops) -> int:
+    return sum(map_ops(ops, inputs))
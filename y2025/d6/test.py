@@ -1,7 +1,9 @@
 import os
+import operator
 import unittest
 
-from y2025.d6.main import compute_totals_sum, parse_lists_and_ops, parse_lists_and_ops_columns
+from y2025.d6.main import compute_totals_sum, parse_lists_and_ops, parse_lists_and_ops_columns, parse_lists_and_ops_mapped, \
+    parse_lists_and_ops_columns_mapped, parallel_map_ops, reduce_op_groups, Op
 
 TESTDATA_FILENAME = os.path.join(os.path.dirname(__file__), 'input_test.txt')
 LIVE_FILENAME = os.path.join(os.path.dirname(__file__), 'input.txt')
@@ -17,6 +19,14 @@ def solve_part_two(file: os.PathLike):
     total = compute_totals_sum(ops, [inputs])
     return total
 
+def solve_part_one_mapped(file: os.PathLike):
+    ops, inputs = parse_lists_and_ops_mapped(file)
+    return compute_totals_sum(ops, inputs)
+
+def solve_part_two_mapped(file: os.PathLike):
+    ops, inputs = parse_lists_and_ops_columns_mapped(file)
+    return compute_totals_sum(ops, [inputs])
+
 
 class Test(unittest.TestCase):
     def test_part_one(self):
@@ -31,6 +41,26 @@ class Test(unittest.TestCase):
     def test_part_two_live(self):
         self.assertEqual(9627174150897, solve_part_two(LIVE_FILENAME))
 
+    def test_reduce_op_groups(self):
+        for file in (TESTDATA_FILENAME, LIVE_FILENAME):
+            ops, inputs = parse_lists_and_ops_mapped(file)
+            self.assertEqual(parallel_map_ops(ops, inputs), reduce_op_groups(ops, inputs))
+            ops, inputs = parse_lists_and_ops_columns_mapped(file)
+            self.assertEqual(parallel_map_ops(ops, [inputs]), reduce_op_groups(ops, [inputs]))
+        # empty cells count as the default, which is not the identity here
+        double = Op(operator.mul, 2, 1)
+        ops = [Op(operator.add, 5, 0), double, double]
+        inputs = [[1, None, 3], [None, 4, None]]
+        self.assertEqual(parallel_map_ops(ops, inputs), reduce_op_groups(ops, inputs))
+
+    def test_part_one_mapped(self):
+        self.assertEqual(4277556, solve_part_one_mapped(TESTDATA_FILENAME))
+        self.assertEqual(5381996914800, solve_part_one_mapped(LIVE_FILENAME))
+
+    def test_part_two_mapped(self):
+        self.assertEqual(3263827, solve_part_two_mapped(TESTDATA_FILENAME))
+        self.assertEqual(9627174150897, solve_part_two_mapped(LIVE_FILENAME))
+
 
 if __name__ == "__main__":
     unittest.main()
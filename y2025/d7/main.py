@@ -1,10 +1,17 @@
 import dataclasses
+import re
 from functools import reduce
 from typing import Iterable
 
 from more_itertools.more import peekable
 
 
+SOURCE = re.compile(r"S")
+SPLITTER = re.compile(r"\^")
+SPLITTER_TABLE = bytes(ord("1") if c == ord("^") else ord("0") for c in range(256))
+SOURCE_TABLE = bytes(ord("1") if c == ord("S") else ord("0") for c in range(256))
+
+
 def parse_inputs(file) -> Iterable[str]:
     with (open(file) as input):
         for row in input:
@@ -57,3 +64,33 @@ def compute_paths(inputs: Iterable[str]) -> int:
     path_counts = reduce(split_paths, inputs, initial_path_counts)
 
     return sum(path_counts)
+
+
+def get_mask(input: str, table: bytes) -> int:
+    """Bitmask of the row cells selected by the table, bit i standing for column i"""
+    return int(input.rstrip("\n").encode()[::-1].translate(table) or b"0", 2)
+
+
+def compute_splits_bitset(inputs: Iterable[str]) -> int:
+    beams = splits = 0
+    for input in inputs:
+        beams |= get_mask(input, SOURCE_TABLE)
+        hits = beams & get_mask(input, SPLITTER_TABLE)
+        splits += hits.bit_count()
+        beams = beams ^ hits | hits << 1 | hits >> 1
+    return splits
+
+
+def compute_paths_by_splitters(inputs: Iterable[str]) -> int:
+    """Same as compute_paths, but only visits the splitters of each row"""
+    inputs = peekable(inputs)
+    path_counts = [0] * len(inputs.peek())
+    for input in inputs:
+        for source in SOURCE.finditer(input):
+            path_counts[source.start()] = 1
+        for splitter in SPLITTER.finditer(input):
+            i = splitter.start()
+            path_counts[i - 1] += path_counts[i]
+            path_counts[i + 1] += path_counts[i]
+            path_counts[i] = 0
+    return sum(path_counts)
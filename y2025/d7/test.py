@@ -1,7 +1,7 @@
 import os
 import unittest
 
-from y2025.d7.main import compute_splits, parse_inputs, compute_paths
+from y2025.d7.main import compute_splits, parse_inputs, compute_paths, compute_splits_bitset, compute_paths_by_splitters
 
 TESTDATA_FILENAME = os.path.join(os.path.dirname(__file__), 'input_test.txt')
 LIVE_FILENAME = os.path.join(os.path.dirname(__file__), 'input.txt')
@@ -17,6 +17,12 @@ def solve_part_two(file: os.PathLike):
     total = compute_paths(inputs)
     return total
 
+def solve_part_one_bitset(file: os.PathLike):
+    return compute_splits_bitset(parse_inputs(file))
+
+def solve_part_two_by_splitters(file: os.PathLike):
+    return compute_paths_by_splitters(parse_inputs(file))
+
 class Test(unittest.TestCase):
     def test_part_one(self):
         self.assertEqual(21, solve_part_one(TESTDATA_FILENAME))
@@ -30,6 +36,14 @@ class Test(unittest.TestCase):
     def test_part_two_live(self):
         self.assertEqual(5137133207830, solve_part_two(LIVE_FILENAME))
 
+    def test_part_one_bitset(self):
+        self.assertEqual(21, solve_part_one_bitset(TESTDATA_FILENAME))
+        self.assertEqual(1504, solve_part_one_bitset(LIVE_FILENAME))
+
+    def test_part_two_by_splitters(self):
+        self.assertEqual(40, solve_part_two_by_splitters(TESTDATA_FILENAME))
+        self.assertEqual(5137133207830, solve_part_two_by_splitters(LIVE_FILENAME))
+
 
 if __name__ == "__main__":
     unittest.main()
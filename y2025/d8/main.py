@@ -1,13 +1,17 @@
 
 import dataclasses
 import heapq
+import math
 import operator
+from collections import defaultdict
 from functools import reduce
+from itertools import combinations, product, repeat, chain
+from operator import add, mul, sub
 from typing import Iterable
 
 from more_itertools import take
-from more_itertools.more import distinct_combinations
 
+from tools.datastructures.disjoint_set import DisjointSet
 from tools.datastructures.points import Point3
 
 
@@ -24,63 +28,95 @@ class PointPair:
     dist_sq: int
 
 
-@dataclasses.dataclass
-class Box:
-    circuit: set[Point3]
-
-
-def join_circuit_pair(circuits: dict[Point3, Box], pair: PointPair) -> set[Point3]:
-    b1 = circuits.get(pair.p1, None)
-    b2 = circuits.get(pair.p2, None)
-    match b1, b2:
-        case None, None:
-            b = Box({pair.p1, pair.p2})
-            circuits[pair.p1] = b
-            circuits[pair.p2] = b
-            return b.circuit
-        case Box(), None:
-            b1.circuit.add(pair.p2)
-            circuits[pair.p2] = b1
-            return b1.circuit
-        case None, Box():
-            b2.circuit.add(pair.p1)
-            circuits[pair.p1] = b2
-            return b2.circuit
-        case _:
-            b1.circuit.update(b2.circuit)
-            for old in b2.circuit:
-                circuits[old].circuit = b1.circuit
-            return b1.circuit
+# neighbouring grid cells that follow a cell, so that every pair of cells is visited once
+FORWARD_OFFSETS = [offset for offset in product((-1, 0, 1), repeat=3) if offset > (0, 0, 0)]
 
 
-def compute_junctions(points: Iterable[Point3], closest_points: int, circuits_to_mult: int) -> int:
-    def compute_circuits(sorted_pairs: list[PointPair]) -> Iterable[set[Point3]]:
-        circuit_map: dict[Point3, Box] = {}
+def get_pairs_within(points: list[Point3], cell: int) -> list[tuple[int, int, int]]:
+    """All (dist_sq, i, j) with i < j and dist_sq <= cell^2, using a uniform grid of the given cell size"""
+    grid: dict[tuple[int, int, int], list[int]] = defaultdict(list)
+    for i, p in enumerate(points):
+        grid[p.x // cell, p.y // cell, p.z // cell].append(i)
+
+    limit = cell * cell
+    pairs = []
+    for (x, y, z), members in grid.items():
+        candidates: list[Iterable[tuple[int, int]]] = [combinations(members, 2)]
+        for dx, dy, dz in FORWARD_OFFSETS:
+            others = grid.get((x + dx, y + dy, z + dz))
+            if others:
+                candidates.append(product(members, others))
+
+        for candidate in candidates:
+            for i, j in candidate:
+                dist_sq = points[i].distance_sq(points[j])
+                if dist_sq <= limit:
+                    pairs.append((dist_sq, min(i, j), max(i, j)))
+
+    return pairs
+
+
+def find_closest_index_pairs(points: list[Point3], count: int) -> list[tuple[int, int, int]]:
+    """Same pairs as heapq.nsmallest over distinct_combinations as (dist_sq, i, j), without enumerating every pair"""
+    if count <= 0 or len(points) < 2:
+        return []
+
+    sizes = [max(coords) - min(coords) for coords in zip(*((p.x, p.y, p.z) for p in points))]
+    max_dist_sq = sum(size * size for size in sizes)
+    # radius expected to hold count pairs if the points were spread evenly over their bounding box
+    volume = math.prod(max(1, size) for size in sizes)
+    radius = max(1.0, (count * volume / (len(points) ** 2 * 2 / 3 * math.pi)) ** (1 / 3))
+
+    while True:
+        pairs = get_pairs_within(points, math.ceil(radius))
+        if len(pairs) >= count or radius * radius >= max_dist_sq:
+            break
+        radius *= 2
 
-        for pair in sorted_pairs:
-            join_circuit_pair(circuit_map, pair)
+    # ties are broken by the point indices, as the combinations order does for the stable nsmallest
+    return heapq.nsmallest(count, pairs)
 
-        return {id(box.circuit): box.circuit for box in circuit_map.values()}.values()
 
-    pairs = map(lambda t: PointPair(t[0], t[1], t[0].distance_sq(t[1])), distinct_combinations(points, 2))
-    min_dists = heapq.nsmallest(closest_points, pairs, lambda pair: pair.dist_sq)
-    circuits = compute_circuits(min_dists)
+def find_closest_pairs(points: list[Point3], count: int) -> list[PointPair]:
+    return [PointPair(points[i], points[j], dist_sq) for dist_sq, i, j in find_closest_index_pairs(points, count)]
 
-    top_circuits = sorted(map(len, circuits), reverse=True)
+
+def compute_junctions(points: Iterable[Point3], closest_points: int, circuits_to_mult: int) -> int:
+    points = list(points)
+    circuits = DisjointSet(len(points))
+    for _, i, j in find_closest_index_pairs(points, closest_points):
+        circuits.union(i, j)
+
+    top_circuits = sorted(map(circuits.size, circuits.roots()), reverse=True)
     return reduce(operator.mul, take(circuits_to_mult, top_circuits))
 
 
-def compute_last_junction(points: Iterable[Point3], closest_points: int, circuits_to_mult: int) -> int:
-    def compute_circuits(sorted_pairs: list[PointPair], point_count: int) -> PointPair | None:
-        circuit_map: dict[Point3, Box] = {}
+def find_longest_mst_edge(points: list[Point3]) -> tuple[int, int]:
+    """Longest edge of the Euclidean minimum spanning tree, by a dense Prim's over coordinate lists in O(n) memory"""
+    n = len(points)
+    coords = [[p.x for p in points], [p.y for p in points], [p.z for p in points]]
+    # distance and indices packed into one int, so that ties are broken by the indices like in a sorted pair list
+    done = (max(p.distance_sq(points[0]) for p in points) * 4 + 1) * n * n
+    best = [done] * n
+    penalties = [0] * n
+    longest = -1
+    current = 0
+
+    for _ in range(n - 1):
+        best[current] = penalties[current] = done
+        dx, dy, dz = (list(map(sub, axis, repeat(axis[current]))) for axis in coords)
+        dists = map(add, map(add, map(mul, dx, dx), map(mul, dy, dy)), map(mul, dz, dz))
+        codes = chain(range(current, current * n, n), range(current * n + current, current * n + n))
+        keys = map(add, map(add, map(mul, dists, repeat(n * n)), codes), penalties)
+        best = list(map(min, best, keys))
+        current = min(range(n), key=best.__getitem__)
+        longest = max(longest, best[current])
 
-        for pair in sorted_pairs:
-            joined_circuit = join_circuit_pair(circuit_map, pair)
-            if len(joined_circuit) == point_count:
-                return pair
+    code = longest % (n * n)
+    return code // n, code % n
 
+
+def compute_last_junction(points: Iterable[Point3], closest_points: int, circuits_to_mult: int) -> int:
     points = list(points)
-    pairs = map(lambda t: PointPair(t[0], t[1], t[0].distance_sq(t[1])), distinct_combinations(points, 2))
-    min_dists = sorted(pairs, key=lambda pair: pair.dist_sq)
-    last_pair = compute_circuits(min_dists, len(points))
-    return last_pair.p1.x * last_pair.p2.x
+    i, j = find_longest_mst_edge(points)
+    return points[i].x * points[j].x
@@ -1,7 +1,10 @@
+import heapq
 import os
 import unittest
 
-from y2025.d8.main import compute_junctions, parse_inputs, compute_last_junction
+from more_itertools.more import distinct_combinations
+
+from y2025.d8.main import compute_junctions, parse_inputs, compute_last_junction, find_closest_pairs, PointPair
 
 TESTDATA_FILENAME = os.path.join(os.path.dirname(__file__), 'input_test.txt')
 LIVE_FILENAME = os.path.join(os.path.dirname(__file__), 'input.txt')
@@ -23,6 +26,11 @@ class Test(unittest.TestCase):
     def test_part_one_live(self):
         self.assertEqual(32103, solve_part_one(LIVE_FILENAME, 1000, 3))
 
+    def test_closest_pairs(self):
+        points = list(parse_inputs(TESTDATA_FILENAME))
+        pairs = (PointPair(p1, p2, p1.distance_sq(p2)) for p1, p2 in distinct_combinations(points, 2))
+        self.assertEqual(heapq.nsmallest(50, pairs, lambda pair: pair.dist_sq), find_closest_pairs(points, 50))
+
     def test_part_two(self):
         self.assertEqual(25272, solve_part_two(TESTDATA_FILENAME, 10, 3))
 
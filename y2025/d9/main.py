@@ -1,13 +1,17 @@
 from __future__ import annotations
 
-from typing import Iterable
+from array import array
+from bisect import insort
+from itertools import accumulate, chain
+from operator import add, gt, lt
+from typing import Callable, Iterable
 
-from more_itertools.more import distinct_combinations, minmax
-from more_itertools.recipes import prepend, triplewise, pairwise, flatten
+from more_itertools.more import chunked, distinct_combinations, minmax
+from more_itertools.recipes import prepend, pairwise
 
-from tools.datastructures.intersections import intersect_rect_segment
+from tools.datastructures.bitarray2d import BitArray2D, get_bit, get_runs
+from tools.datastructures.intersections import SegmentIndex
 from tools.datastructures.points import Point2, Rectangle, Segment
-from tools.math import sign
 
 
 def parse_inputs(file) -> Iterable[Point2]:
@@ -17,67 +21,214 @@ def parse_inputs(file) -> Iterable[Point2]:
 
 
 def get_largest_square(points: Iterable[Point2]) -> int:
+    return get_largest_square_staircases(points)
+
+
+def get_largest_square_all_pairs(points: Iterable[Point2]) -> int:
     return max(map(Rectangle.area, (Rectangle(p[0], p[1]) for p in distinct_combinations(points, 2))))
 
 
-def get_largest_square_flood_fill(points: Iterable[Point2]) -> int:
-    def get_shape_directions(points: list[Point2]) -> int:
-        points = prepend(points[-1], points)
-        dots = (sign((c - p1).cross_sign(p2 - c)) for p1, c, p2 in triplewise(points))
-        return sign(sum(dots))
+def get_staircases(points: Iterable[Point2]) -> tuple[list[Point2], list[Point2], list[Point2], list[Point2]]:
+    """Points not dominated towards the lower left, upper right, upper left and lower right corner"""
+    lowest: dict[int, int] = {}
+    highest: dict[int, int] = {}
+    for p in points:
+        if p.y < lowest.get(p.x, p.y + 1): lowest[p.x] = p.y
+        if p.y > highest.get(p.x, p.y - 1): highest[p.x] = p.y
+
+    def get_staircase(xs: Iterable[int], extremes: dict[int, int], is_beyond: Callable[[int, int], bool]) -> list[Point2]:
+        staircase: list[Point2] = []
+        for x in xs:
+            if not staircase or is_beyond(extremes[x], staircase[-1].y):
+                staircase.append(Point2(x, extremes[x]))
+        return staircase
+
+    xs = sorted(lowest)
+    return (get_staircase(xs, lowest, lt), get_staircase(reversed(xs), highest, gt),
+            get_staircase(xs, highest, gt), get_staircase(reversed(xs), lowest, lt))
+
+
+def get_largest_area_between(corners: list[Point2], opposite: list[Point2]) -> int:
+    """
+    Largest rectangle spanned from the lower left staircase to the upper right one, both by ascending x.
+    Moving a corner right never moves its best partner left, so dividing and conquering over the corners
+    scores O(k log k) pairs
+    """
+    def get_area(p: Point2, q: Point2) -> int:
+        width, height = q.x - p.x + 1, q.y - p.y + 1
+        # a partner to the lower left does not span the rectangle the product would claim
+        return -width * height if width <= 0 and height <= 0 else width * height
+
+    def get_largest_area(first: int, last: int, lowest: int, highest: int) -> int:
+        if first > last: return 0
+        middle = (first + last) // 2
+        best = max(range(lowest, highest + 1), key=lambda j: get_area(corners[middle], opposite[j]))
+        return max(get_area(corners[middle], opposite[best]),
+                   get_largest_area(first, middle - 1, lowest, best), get_largest_area(middle + 1, last, best, highest))
+
+    return get_largest_area(0, len(corners) - 1, 0, len(opposite) - 1) if opposite else 0
+
+
+def get_largest_square_staircases(points: Iterable[Point2]) -> int:
+    # moving a corner further out never shrinks the rectangle, so an optimal pair joins opposite staircases;
+    # those include the convex hull vertices, but the hull alone can miss the optimum
+    lower_left, upper_right, upper_left, lower_right = get_staircases(points)
+    # upper left and lower right staircases mirrored vertically are lower left and upper right ones
+    upper_left = [Point2(p.x, -p.y) for p in upper_left]
+    lower_right = [Point2(p.x, -p.y) for p in lower_right]
+    return max(get_largest_area_between(lower_left, upper_right[::-1]), get_largest_area_between(upper_left, lower_right[::-1]))
+
+
+def get_compressed_coordinates(points: list[Point2], margin: bool = False) -> tuple[dict[int, int], dict[int, int]]:
+    """The compressed column of each x and row of each y that starts a run, with a margin run before the lowest if asked"""
+    # a bitmap with a bit per tile would take gigabytes on the real inputs, but each vertex coordinate and the one
+    # after it start a run of tiles that are all inside or all outside, so one cell per run is enough
+    xs = {x for p in points for x in (p.x, p.x + 1)}
+    ys = {y for p in points for y in (p.y, p.y + 1)}
+    if margin:
+        xs.add(min(xs) - 1)
+        ys.add(min(ys) - 1)
+    return {x: i for i, x in enumerate(sorted(xs))}, {y: i for i, y in enumerate(sorted(ys))}
 
-    def get_edge_points(points: list[Point2]) -> set[Point2]:
-        return set(flatten(Rectangle.get_points_inside(p1, p2) for p1, p2 in pairwise(prepend(points[-1], points))))
 
-    def find_inside_seed(points: list[Point2], direction: int) -> Point2:
-        for p1, c, p2 in triplewise(prepend(points[-1], points)):
-            if p1.x == p2.x or p1.y == p2.y: continue  # there is no 'inside' point
-            if sign((c - p1).cross_sign(p2 - c)) != direction: continue  # the corner is facing outward
-            return p1 + (p2 - p1) // 2
-        raise Exception(f"Could not find inside seed: {points}")
+def get_largest_square_flood_fill(points: Iterable[Point2]) -> int:
+    def draw_edges(points: list[Point2], walls: BitArray2D) -> None:
+        for p1, p2 in pairwise(prepend(points[-1], points)):
+            c1, c2 = minmax(col_of[p1.x], col_of[p2.x])
+            r1, r2 = minmax(row_of[p1.y], row_of[p2.y])
+            for row in range(r1, r2 + 1):
+                for col in range(c1, c2 + 1):
+                    walls[row, col] = 1
+
+    def flood_fill_outsides(walls: BitArray2D) -> BitArray2D:
+        outsides = BitArray2D(rows=walls.rows, columns=walls.columns)
 
-    def flood_fill_insides(edges: set[Point2], inside_seed: Point2) -> set[Point2]:
-        stack = [inside_seed]
-        insides = set()
+        def is_open(row: int, col: int) -> bool:
+            return not get_bit(walls, row, col) and not get_bit(outsides, row, col)
 
+        stack = [(0, 0)]
         while len(stack) > 0:
-            point = stack.pop()
-            insides.add(point)
-            for n in point.get_neighbours():
-                if n in insides or n in edges: continue
-                stack.append(n)
+            row, col = stack.pop()
+            if not is_open(row, col): continue
+            left, right = col, col
+            while left > 0 and is_open(row, left - 1): left -= 1
+            while right < walls.columns - 1 and is_open(row, right + 1): right += 1
+            for col in range(left, right + 1):
+                outsides[row, col] = 1
+            # seed every open span of the rows above and below that touches this one
+            for next_row in (row - 1, row + 1):
+                if not 0 <= next_row < walls.rows: continue
+                for col in range(left, right + 1):
+                    if is_open(next_row, col) and (col == left or not is_open(next_row, col - 1)):
+                        stack.append((next_row, col))
+
+        return outsides
+
+    def get_run_ends(insides: BitArray2D) -> list[array]:
+        """For each cell the last column of the run of inside cells it is in, -1 for outside cells"""
+        run_ends = []
+        for row in range(insides.rows):
+            ends = array('q', [-1] * insides.columns)
+            for start, end in get_runs(insides, row):
+                ends[start:end] = array('q', [end - 1] * (end - start))
+            run_ends.append(ends)
+        return run_ends
+
+    def is_valid_rectangle(run_ends: list[array], p1: Point2, p2: Point2) -> bool:
+        c1, c2 = minmax(col_of[p1.x], col_of[p2.x])
+        r1, r2 = minmax(row_of[p1.y], row_of[p2.y])
+        return all(run_ends[row][c1] >= c2 for row in range(r1, r2 + 1))
 
-        return insides
+    points = list(points)
+    # the runs before the lowest and after the highest coordinates are a margin the outside can flow around
+    col_of, row_of = get_compressed_coordinates(points, margin=True)
 
-    def get_valid_rectangles(points: list[Point2], edges: set[Point2]) -> Iterable[Rectangle]:
-        rectangles = (Rectangle(p[0], p[1]) for p in distinct_combinations(points, 2))
-        return filter(lambda r: all(p in edges for p in r.points_inside()), rectangles)
+    walls = BitArray2D(rows=len(row_of), columns=len(col_of))
+    draw_edges(points, walls)
+    run_ends = get_run_ends(~flood_fill_outsides(walls))
 
-    points = list(points)
-    direction = get_shape_directions(points)
-    edges = get_edge_points(points)
-    insides = flood_fill_insides(edges, find_inside_seed(points, direction))
-    valid_rectangles = get_valid_rectangles(points, edges | insides)
-    return max(map(Rectangle.area, valid_rectangles))
+    max_area = 0
+    for p1, p2 in distinct_combinations(points, 2):
+        area = Rectangle.get_area(p1, p2)
+        if area <= max_area: continue
+        if is_valid_rectangle(run_ends, p1, p2):
+            max_area = area
+    return max_area
 
 
 def get_largest_square_connected(points: Iterable[Point2]) -> int:
-    # return get_largest_square_flood_fill(points)
+    return get_largest_square_compressed(points)
+
+
+def get_outside_prefix_sums(points: list[Point2], col_of: dict[int, int], row_of: dict[int, int]) -> list[array]:
+    """2D prefix sums of the compressed cells lying outside the polygon, cell (row_of[y], col_of[x]) being the run of tiles starting at (x, y)"""
+    starts: list[list[int]] = [[] for _ in row_of]
+    ends: list[list[int]] = [[] for _ in row_of]
+    horizontals: list[list[tuple[int, int]]] = [[] for _ in row_of]
+
+    for p1, p2 in pairwise(prepend(points[-1], points)):
+        x1, x2 = minmax(p1.x, p2.x)
+        y1, y2 = minmax(p1.y, p2.y)
+        if x1 == x2:
+            starts[row_of[y1]].append(col_of[x1])
+            ends[row_of[y2]].append(col_of[x1])
+        else:
+            horizontals[row_of[y1]].append((col_of[x1], col_of[x2]))
+
+    # vertical edges crossing the row, those spanning [y1, y2) cross it just above the tile centers
+    crossings: list[int] = []
+    prefix_sums = [array('q', [0] * (len(col_of) + 1))]
+    for row in range(len(row_of)):
+        for col in ends[row]:
+            crossings.remove(col)
+        for col in starts[row]:
+            insort(crossings, col)
+
+        inside = bytearray(len(col_of))
+        for c1, c2 in chain(zip(crossings[::2], crossings[1::2]), horizontals[row]):
+            inside[c1:c2 + 1] = b"\x01" * (c2 + 1 - c1)
+        outside = (1 - cell for cell in inside)
+        prefix_sums.append(array('q', map(add, prefix_sums[-1], accumulate(outside, initial=0))))
+
+    return prefix_sums
+
+
+def get_largest_square_compressed(points: Iterable[Point2]) -> int:
+    points = list(points)
+    col_of, row_of = get_compressed_coordinates(points)
+    prefix_sums = get_outside_prefix_sums(points, col_of, row_of)
+
+    max_area = 0
+    for p1, p2 in distinct_combinations(points, 2):
+        area = Rectangle.get_area(p1, p2)
+        if area <= max_area: continue
+        c1, c2 = minmax(col_of[p1.x], col_of[p2.x])
+        r1, r2 = minmax(row_of[p1.y], row_of[p2.y])
+        outside = prefix_sums[r2 + 1][c2 + 1] - prefix_sums[r1][c2 + 1] - prefix_sums[r2 + 1][c1] + prefix_sums[r1][c1]
+        if outside == 0:
+            max_area = area
+
+    return max_area
+
+
+def get_largest_square_edge_checks(points: Iterable[Point2]) -> int:
 
     def downsized(r: Rectangle) -> Rectangle | None:
-        x1, x2 = minmax(r.p1.x, r.p2.x)
-        y1, y2 = minmax(r.p1.y, r.p2.y)
+        x1, x2 = min(r.p1.x, r.p2.x), max(r.p1.x, r.p2.x)
+        y1, y2 = min(r.p1.y, r.p2.y), max(r.p1.y, r.p2.y)
         if x1 + 2 > x2 or y1 + 2 > y2: return None
         return Rectangle(Point2(x1 + 1, y1 + 1), Point2(x2 - 1, y2 - 1))
 
-    points = list(points)
-    rectangles = (Rectangle(p[0], p[1]) for p in distinct_combinations(points, 2))
-    lines = list(Segment(p1, p2) for p1, p2 in pairwise(prepend(points[-1], points)))
-    max_area = 0
-    for r in rectangles:
-        if r.area() <= max_area: continue
-        r2 = downsized(r)
-        if not r2 or not any(intersect_rect_segment(r2, s) for s in lines):
-            if r.area() > max_area: max_area = r.area()
+    def get_area(r: Rectangle) -> int:
+        return (abs(r.p1.x - r.p2.x) + 1) * (abs(r.p1.y - r.p2.y) + 1)
 
-    return max_area
+    points = list(points)
+    rectangles = sorted((Rectangle(p[0], p[1]) for p in distinct_combinations(points, 2)), key=get_area, reverse=True)
+    lines = SegmentIndex.from_segments(Segment(p1, p2) for p1, p2 in pairwise(prepend(points[-1], points)))
+    # the largest rectangles come first, so the first batch holding a valid one holds the answer
+    for batch in chunked(rectangles, 4096):
+        insides = list(map(downsized, batch))
+        crossed = iter(lines.intersects_batch(r for r in insides if r))
+        for r, inside in zip(batch, insides):
+            if not inside or not next(crossed): return get_area(r)
+    return 0
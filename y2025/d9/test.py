@@ -1,7 +1,8 @@
 import os
 import unittest
 
-from y2025.d9.main import get_largest_square, parse_inputs, get_largest_square_connected
+from y2025.d9.main import get_largest_square, parse_inputs, get_largest_square_connected, get_largest_square_edge_checks, \
+    get_largest_square_all_pairs, get_largest_square_flood_fill
 
 TESTDATA_FILENAME = os.path.join(os.path.dirname(__file__), 'input_test.txt')
 LIVE_FILENAME = os.path.join(os.path.dirname(__file__), 'input.txt')
@@ -26,9 +27,21 @@ class Test(unittest.TestCase):
     def test_part_one_live(self):
         self.assertEqual(4755429952, solve_part_one(LIVE_FILENAME))
 
+    def test_part_one_all_pairs(self):
+        self.assertEqual(50, get_largest_square_all_pairs(parse_inputs(TESTDATA_FILENAME)))
+        self.assertEqual(4755429952, get_largest_square_all_pairs(parse_inputs(LIVE_FILENAME)))
+
     def test_part_two(self):
         self.assertEqual(24, solve_part_two(TESTDATA_FILENAME))
 
+    def test_part_two_edge_checks(self):
+        self.assertEqual(24, get_largest_square_edge_checks(parse_inputs(TESTDATA_FILENAME)))
+        self.assertEqual(1429596008, get_largest_square_edge_checks(parse_inputs(LIVE_FILENAME)))
+
+    def test_part_two_flood_fill(self):
+        self.assertEqual(24, get_largest_square_flood_fill(parse_inputs(TESTDATA_FILENAME)))
+        self.assertEqual(1429596008, get_largest_square_flood_fill(parse_inputs(LIVE_FILENAME)))
+
     def test_part_two_live(self):
         self.assertEqual(1429596008, solve_part_two(LIVE_FILENAME))
 